@@ -0,0 +1,157 @@
+import edu.mit.csail.sdg.alloy4.A4Reporter;
+import edu.mit.csail.sdg.alloy4.Err;
+import edu.mit.csail.sdg.ast.Command;
+import edu.mit.csail.sdg.ast.Module;
+import edu.mit.csail.sdg.ast.Sig;
+import edu.mit.csail.sdg.ast.Sig.Field;
+import edu.mit.csail.sdg.parser.CompUtil;
+import edu.mit.csail.sdg.translator.A4Options;
+import edu.mit.csail.sdg.translator.A4Solution;
+import edu.mit.csail.sdg.translator.A4Tuple;
+import edu.mit.csail.sdg.translator.A4TupleSet;
+import edu.mit.csail.sdg.translator.TranslateAlloyToKodkod;
+import kodkod.engine.satlab.SATFactory;
+import java.io.BufferedWriter;
+import java.io.OutputStreamWriter;
+import java.io.PrintWriter;
+import java.nio.charset.StandardCharsets;
+
+/**
+ * Streams the instances of a run command to stdout, one JSON trace per line.
+ *
+ * The next instance is only requested from the solver once the previous one has
+ * been written. Writing blocks once the pipe buffer is full, so the enumeration
+ * runs ahead of a slow reader by at most a pipe buffer worth of instances.
+ */
+public class AlloyEnumerator {
+
+    public static void main(String[] args) throws Err {
+        if (args.length < 1) {
+            System.err.println("Usage: java AlloyEnumerator <als_file> [command_index] [max_instances]");
+            System.err.println("  <als_file>: Alloy model file");
+            System.err.println("  [command_index]: Command to enumerate; if omitted, the commands are listed");
+            System.err.println("  [max_instances]: Optional, stop after this many instances (default: all)");
+            System.exit(1);
+        }
+
+        String filename = args[0];
+        Integer commandIndex = null;
+        long maxInstances = -1;
+
+        try {
+            if (args.length > 1) {
+                commandIndex = Integer.parseInt(args[1]);
+            }
+            if (args.length > 2) {
+                maxInstances = Long.parseLong(args[2]);
+            }
+        } catch (NumberFormatException e) {
+            System.err.println("[command_index] and [max_instances] must be integers if provided");
+            System.exit(1);
+        }
+
+        A4Reporter rep = new A4Reporter();
+        Module world = CompUtil.parseEverything_fromFile(rep, null, filename);
+
+        if (commandIndex == null) {
+            for (int i = 0; i < world.getAllCommands().size(); i++) {
+                System.out.println(i + "\t" + world.getAllCommands().get(i));
+            }
+            return;
+        }
+
+        if (commandIndex >= world.getAllCommands().size()) {
+            System.err.println("Command index out of range");
+            System.exit(1);
+        }
+
+        A4Options options = new A4Options();
+        options.solver = SATFactory.DEFAULT;
+        options.skolemDepth = 1;
+        options.symmetry = 20;
+
+        Command cmd = world.getAllCommands().get(commandIndex);
+        A4Solution sol = TranslateAlloyToKodkod.execute_command(rep, world.getAllReachableSigs(), cmd, options);
+
+        PrintWriter out = new PrintWriter(new BufferedWriter(new OutputStreamWriter(System.out, StandardCharsets.UTF_8)));
+        long count = 0;
+
+        while (sol.satisfiable() && (maxInstances < 0 || count < maxInstances)) {
+            out.println(toJson(sol));
+            out.flush();
+
+            // The reader closed the pipe, no one wants more instances
+            if (out.checkError()) {
+                break;
+            }
+
+            count++;
+            sol = sol.next();
+        }
+
+        System.err.println("Enumerated " + count + " instances of \"" + cmd + "\"");
+    }
+
+    /** Serializes every state of the trace as a map from sig/field label to tuples of atoms. */
+    private static String toJson(A4Solution sol) throws Err {
+        StringBuilder sb = new StringBuilder();
+        sb.append("{\"loop\":").append(sol.getLoopState()).append(",\"states\":[");
+
+        for (int state = 0; state < sol.getTraceLength(); state++) {
+            if (state > 0) {
+                sb.append(',');
+            }
+            sb.append('{');
+            boolean first = true;
+            for (Sig sig : sol.getAllReachableSigs()) {
+                if (sig.builtin) {
+                    continue;
+                }
+                first = appendRelation(sb, sig.label, sol.eval(sig, state), first);
+                for (Field field : sig.getFields()) {
+                    first = appendRelation(sb, sig.label + "." + field.label, sol.eval(field, state), first);
+                }
+            }
+            sb.append('}');
+        }
+
+        sb.append("]}");
+        return sb.toString();
+    }
+
+    private static boolean appendRelation(StringBuilder sb, String label, A4TupleSet tuples, boolean first) {
+        if (!first) {
+            sb.append(',');
+        }
+        appendString(sb, label);
+        sb.append(":[");
+        boolean firstTuple = true;
+        for (A4Tuple tuple : tuples) {
+            if (!firstTuple) {
+                sb.append(',');
+            }
+            sb.append('[');
+            for (int i = 0; i < tuple.arity(); i++) {
+                if (i > 0) {
+                    sb.append(',');
+                }
+                appendString(sb, tuple.atom(i));
+            }
+            sb.append(']');
+            firstTuple = false;
+        }
+        sb.append(']');
+        return false;
+    }
+
+    private static void appendString(StringBuilder sb, String value) {
+        sb.append('"');
+        for (char c : value.toCharArray()) {
+            if (c == '"' || c == '\\') {
+                sb.append('\\');
+            }
+            sb.append(c);
+        }
+        sb.append('"');
+    }
+}
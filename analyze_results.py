@@ -9,8 +9,16 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import glob
 import os
+import re
 from pathlib import Path
 
+# Alloy models whose results can be analyzed, keyed by the name used to
+# namespace their results. Both reuse the check names c_srp* and c_fqp*.
+MODELS = {
+    'rollup': 'Generic',
+    'scroll': 'Scroll'
+}
+
 def parse_time(time_str):
     """Parse time string like '499ms' or '1057ms' and return seconds."""
     if 'ms' in time_str:
@@ -24,7 +32,18 @@ def extract_step_number(step_str):
     """Extract the maximum step number from strings like '1..1', '1..2', etc."""
     return int(step_str.split('..')[-1])
 
-def load_results_data(results_dir):
+def results_dir_for(model, scope, steps):
+    """Return the results directory of a model for the given scope and steps."""
+    if model == 'rollup':
+        return f"results/results_{scope}_{steps}"
+    return f"results/{model}/results_{scope}_{steps}"
+
+def extract_property(command):
+    """Extract the check name from a command like 'Check c_srp1 for 5 but 1..10 steps'."""
+    match = re.search(r'\b(c_\w+)', command)
+    return match.group(1) if match else command
+
+def load_results_data(results_dir, model='rollup'):
     """Load all CSV files from a results directory and aggregate the data."""
     all_data = []
     
@@ -57,6 +76,12 @@ def load_results_data(results_dir):
                     scope = int(command.split('for ')[1].split(' but')[0])
                 df['Scope'] = scope
             
+            # Namespace the rows by model so that checks sharing a name
+            # across models are never mixed
+            df['Model'] = model
+            df['Property'] = df['Command'].apply(extract_property)
+            df['Model_Property'] = model + '/' + df['Property']
+            
             all_data.append(df)
             
         except Exception as e:
@@ -70,9 +95,11 @@ def load_results_data(results_dir):
     combined_df = pd.concat(all_data, ignore_index=True)
     return combined_df
 
-def categorize_mechanism(command):
+def categorize_mechanism(command, model='rollup'):
     """Categorize the command into mechanism types."""
-    if 'c_srp' in command:
+    if model == 'scroll' and 'c_sp' in command:
+        return 'Scroll Specific'
+    elif 'c_srp' in command:
         return 'Simple'
     elif 'c_fqp' in command:
         return 'Forced Queue'
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Script to benchmark the Scroll model against the generic forced queue model and
+compare how costly each one is to verify.
+"""
+
+import argparse
+import os
+import subprocess
+
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+
+from analyze_results import MODELS, categorize_mechanism, load_results_data, results_dir_for
+
+# Properties checked by both models (same names, different specifications)
+SHARED_PROPERTIES = {
+    'Simple': ['c_srp1', 'c_srp2', 'c_srp3', 'c_srp4'],
+    'Forced Queue': ['c_fqp1', 'c_fqp2', 'c_fqp3', 'c_fqp4', 'c_fqp5', 'c_fqp6']
+}
+
+# Properties that only exist in the Scroll model (enforced mode, rolling hash, fees)
+SCROLL_PROPERTIES = {
+    'Scroll Specific': ['c_sp1', 'c_sp2', 'c_sp3', 'c_sp4']
+}
+
+def model_file_for(model, scope, steps):
+    """Return the generated Alloy properties file of a model for the given scope and steps."""
+    if model == 'rollup':
+        return f"rollup_properties_{scope}_{steps}.als"
+    return f"{model}/{model}_properties_{scope}_{steps}.als"
+
+def run_benchmark(scopes, steps, classpath):
+    """Run AlloyRunner on both models over the same scope/step grid."""
+    for scope in scopes:
+        for model in MODELS:
+            output_dir = results_dir_for(model, scope, steps)
+
+            # AlloyRunner refuses to write to an existing directory, so reuse it
+            if os.path.exists(output_dir):
+                print(f"Skipping {model} (scope {scope}, steps {steps}): '{output_dir}' already exists")
+                continue
+
+            subprocess.run(['bash', 'prepare_template.sh', str(scope), str(steps), model], check=True)
+
+            print(f"Running {model} (scope {scope}, steps {steps}) into '{output_dir}'...")
+            subprocess.run(['java', '-cp', classpath, 'AlloyRunner',
+                            model_file_for(model, scope, steps), output_dir], check=True)
+
+def load_comparison_data(scopes, steps):
+    """Load the results of both models, keeping only properties that can be compared."""
+    all_data = []
+
+    for scope in scopes:
+        for model in MODELS:
+            data = load_results_data(results_dir_for(model, scope, steps), model)
+
+            if data.empty:
+                print(f"Warning: no results for {model} (scope {scope}, steps {steps})")
+                continue
+
+            data['Mechanism'] = data['Command'].apply(lambda command: categorize_mechanism(command, model))
+            all_data.append(data)
+
+    if not all_data:
+        return pd.DataFrame()
+
+    combined_df = pd.concat(all_data, ignore_index=True)
+
+    # The generic model is only compared on its forced queue (and underlying simple) properties
+    compared = [prop for props in SHARED_PROPERTIES.values() for prop in props]
+    compared += [prop for props in SCROLL_PROPERTIES.values() for prop in props]
+    return combined_df[combined_df['Property'].isin(compared)]
+
+def summarize_property(data, model, prop, steps):
+    """Return the summed clauses and solve time of a property, or None if it has no results."""
+    prop_data = data[
+        (data['Model'] == model) &
+        (data['Property'] == prop) &
+        (data['Step_num'] <= steps)
+    ]
+
+    if prop_data.empty:
+        return None
+
+    return prop_data['Clauses'].sum(), prop_data['Time_seconds'].sum()
+
+def create_property_comparison_tables(data, scopes, steps):
+    """Create per-property tables comparing the generic model and the Scroll model."""
+
+    properties = {**SHARED_PROPERTIES, **SCROLL_PROPERTIES}
+
+    for scope in scopes:
+        scope_data = data[data['Scope'] == scope]
+        rows = []
+
+        for mechanism, prop_list in properties.items():
+            for prop in prop_list:
+                generic = summarize_property(scope_data, 'rollup', prop, steps)
+                scroll = summarize_property(scope_data, 'scroll', prop, steps)
+
+                if generic is None and scroll is None:
+                    continue
+
+                # Ratio > 1 means the Scroll model is more expensive to verify
+                ratio = None
+                if generic is not None and scroll is not None and generic[1] > 0:
+                    ratio = scroll[1] / generic[1]
+
+                rows.append({
+                    'Mechanism': mechanism,
+                    'Property': prop,
+                    'Generic': generic,
+                    'Scroll': scroll,
+                    'Time_Ratio': ratio
+                })
+
+        # Print table
+        print(f"\n{'='*100}")
+        print(f"MODEL COMPARISON TABLE - Scope {scope}, Steps 1-{steps}")
+        print(f"{'='*100}")
+        print()
+        print("| Mechanism | Property | Generic Clauses | Generic Time (sec) | Scroll Clauses | Scroll Time (sec) | Time Ratio |")
+        print("|-----------|----------|-----------------|--------------------|----------------|-------------------|------------|")
+
+        for row in rows:
+            cells = format_comparison_cells(row)
+            print(f"| {row['Mechanism']} | {row['Property']} | " + " | ".join(cells) + " |")
+
+        print()
+
+        # Create LaTeX table
+        create_comparison_latex_table(rows, scope, steps, f"reports/model_comparison_scope_{scope}_steps_{steps}.tex")
+
+    print("Model comparison LaTeX tables have been saved to the reports directory.")
+
+def format_comparison_cells(row):
+    """Format the clauses, time and ratio cells of a comparison row."""
+    cells = []
+
+    for model in ['Generic', 'Scroll']:
+        if row[model] is None:
+            cells.extend(['-', '-'])
+        else:
+            clauses, time = row[model]
+            cells.extend([f"{clauses:,.0f}", f"{time:.3f}"])
+
+    cells.append('-' if row['Time_Ratio'] is None else f"{row['Time_Ratio']:.2f}")
+    return cells
+
+def create_comparison_latex_table(rows, scope, steps, filename):
+    """Create a LaTeX table comparing the generic model and the Scroll model per property."""
+
+    latex_content = r"""\begin{table}[htbp]
+\centering
+\begin{tabular}{|l|l|c|c|c|c|c|}
+\hline
+\textbf{Mechanism} & \textbf{Property} & \textbf{Generic Clauses} & \textbf{Generic Time (sec)} & \textbf{Scroll Clauses} & \textbf{Scroll Time (sec)} & \textbf{Time Ratio} \\
+\hline
+"""
+
+    for row in rows:
+        cells = format_comparison_cells(row)
+        prop = row['Property'].replace('_', r'\_')
+        latex_content += f"{row['Mechanism']} & {prop} & " + " & ".join(cells) + " \\\\\n"
+
+    latex_content += r"""\hline
+\end{tabular}
+\caption{Generic forced queue model versus Scroll model (Scope """ + str(scope) + r""", Steps 1-""" + str(steps) + r""")}
+\label{tab:model_comparison_scope_""" + str(scope) + r"""_steps_""" + str(steps) + r"""}
+\end{table}"""
+
+    with open(filename, 'w') as f:
+        f.write(latex_content)
+
+    print(f"Model comparison LaTeX table saved as '{filename}'")
+
+def scaling_series(data, scope):
+    """Return the (name, label, data) series to compare for a scope.
+
+    Both models are restricted to the shared properties that both of them have
+    results for, so their series average over the same property set. The
+    Scroll-specific properties are returned as a separate series.
+    """
+    scope_data = data[data['Scope'] == scope]
+
+    shared = [prop for props in SHARED_PROPERTIES.values() for prop in props]
+    for model in MODELS:
+        model_props = set(scope_data[scope_data['Model'] == model]['Property'])
+        shared = [prop for prop in shared if prop in model_props]
+
+    series = []
+    for model, label in MODELS.items():
+        series.append((model, label, scope_data[(scope_data['Model'] == model) &
+                                                (scope_data['Property'].isin(shared))]))
+
+    scroll_props = [prop for props in SCROLL_PROPERTIES.values() for prop in props]
+    series.append(('scroll_specific', 'Scroll Specific',
+                   scope_data[(scope_data['Model'] == 'scroll') &
+                              (scope_data['Property'].isin(scroll_props))]))
+    return series
+
+def create_scaling_plots(data, scopes, steps):
+    """Create plots showing how solve time and clauses scale with steps for both models."""
+
+    plt.style.use('default')
+
+    fig, axes = plt.subplots(2, len(scopes), figsize=(3.5 * len(scopes), 5.6), squeeze=False)
+
+    # Define colors that are colorblind-friendly
+    colors = {'rollup': '#1f77b4', 'scroll': '#ff7f0e', 'scroll_specific': '#2ca02c'}  # Blue, orange and green
+    markers = {'rollup': 'o', 'scroll': 's', 'scroll_specific': '^'}  # Circle, square and triangle
+
+    for col, scope in enumerate(scopes):
+        time_ax = axes[0][col]
+        clauses_ax = axes[1][col]
+
+        for name, label, series_data in scaling_series(data, scope):
+            if series_data.empty:
+                continue
+
+            step_stats = series_data.groupby('Step_num').agg({
+                'Time_seconds': ['mean', 'min', 'max'],
+                'Clauses': ['mean', 'min', 'max']
+            })
+
+            for ax, column in [(time_ax, 'Time_seconds'), (clauses_ax, 'Clauses')]:
+                # Plot mean line with a shaded min-max range across properties
+                ax.plot(step_stats.index, step_stats[(column, 'mean')],
+                        color=colors[name], marker=markers[name], linewidth=2,
+                        markersize=5, label=label)
+                ax.fill_between(step_stats.index, step_stats[(column, 'min')], step_stats[(column, 'max')],
+                                color=colors[name], alpha=0.2, edgecolor='none')
+
+        time_ax.set_title(f'Scope {scope}', fontsize=10)
+        time_ax.set_ylabel('Execution Time (seconds)', fontsize=10)
+        clauses_ax.set_ylabel('Clauses', fontsize=10)
+
+        for ax in [time_ax, clauses_ax]:
+            ax.set_xlabel('Steps', fontsize=10)
+            ax.set_xlim(0.5, steps + 0.5)
+            ax.set_xticks(range(1, steps + 1))
+            ax.set_yscale('log')  # Use log scale for better visualization
+            ax.grid(True, alpha=0.3, which='major')
+            ax.legend(frameon=True, fancybox=False, shadow=False,
+                      loc='upper left', fontsize=9)
+
+    # Adjust layout
+    plt.tight_layout()
+
+    # Save the plot
+    plt.savefig('reports/model_comparison_scaling.pdf',
+                dpi=300, bbox_inches='tight', format='pdf')
+    plt.savefig('reports/model_comparison_scaling.png',
+                dpi=300, bbox_inches='tight', format='png')
+
+    print("Plot saved as 'reports/model_comparison_scaling.pdf' and 'reports/model_comparison_scaling.png'")
+
+def print_scaling_summary(data, scopes):
+    """Print how fast the solve time of each series grows per additional step."""
+
+    print(f"\n{'='*80}")
+    print("SCALING SUMMARY")
+    print(f"{'='*80}")
+    print()
+    print("| Series | Scope | First Step | Time at First Step (sec) | Time at Max Step (sec) | Growth per Step |")
+    print("|--------|-------|------------|--------------------------|------------------------|-----------------|")
+
+    for scope in scopes:
+        for name, label, series_data in scaling_series(data, scope):
+            if series_data.empty:
+                continue
+
+            mean_time = series_data.groupby('Step_num')['Time_seconds'].mean()
+
+            # Steps solved in 0ms cannot be fitted on a log scale
+            positive_time = mean_time[mean_time > 0]
+
+            if len(positive_time) < 2:
+                continue
+
+            # Fit log(time) = a + b * step, so exp(b) is the growth factor per step
+            slope = np.polyfit(positive_time.index, np.log(positive_time.values), 1)[0]
+            print(f"| {label} | {scope} | {mean_time.index[0]} | {mean_time.iloc[0]:.3f} | {mean_time.iloc[-1]:.3f} | {np.exp(slope):.2f}x |")
+
+    print()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--scopes', type=int, nargs='+', default=[5, 10],
+                        help='Scopes to benchmark (default: 5 10)')
+    parser.add_argument('--steps', type=int, default=10,
+                        help='Maximum number of steps to benchmark (default: 10)')
+    parser.add_argument('--run', action='store_true',
+                        help='Run AlloyRunner for missing results before analyzing them')
+    parser.add_argument('--classpath', default='.:lib/*',
+                        help="Classpath with AlloyRunner and the Alloy JARs (default: '.:lib/*')")
+    args = parser.parse_args()
+
+    if args.run:
+        run_benchmark(args.scopes, args.steps, args.classpath)
+
+    data = load_comparison_data(args.scopes, args.steps)
+
+    if data.empty:
+        print("Error: Could not load data from results directories")
+        return
+
+    os.makedirs('reports', exist_ok=True)
+    create_property_comparison_tables(data, args.scopes, args.steps)
+    create_scaling_plots(data, args.scopes, args.steps)
+    print_scaling_summary(data, args.scopes)
+
+if __name__ == "__main__":
+    print("Comparing the Scroll model against the generic model...")
+    main()
+    print("Comparison complete!")
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Script to enumerate distinct traces of the run scenarios (e.g., rollup_scenarios.als)
+and save them in batches to be used as test vectors.
+"""
+
+import argparse
+import gzip
+import hashlib
+import itertools
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+def list_commands(als_file, classpath='.:lib/*'):
+    """Return the (index, command) pairs of an Alloy model file."""
+    output = subprocess.run(['java', '-cp', classpath, 'AlloyEnumerator', als_file],
+                            capture_output=True, text=True, check=True).stdout
+    commands = []
+    for line in output.splitlines():
+        index, command = line.split('\t', 1)
+        commands.append((int(index), command))
+    return commands
+
+def stream_instances(als_file, command_index, classpath='.:lib/*', max_instances=None):
+    """Lazily yield the traces of a command as AlloyEnumerator produces them.
+
+    Every trace is a dict with the index of the state the trace loops back to
+    ('loop') and, for each state, the tuples of every sig and field ('states').
+    AlloyEnumerator blocks once the pipe buffer is full, so how far the solver
+    runs ahead of the consumer is bounded by the size of the pipe buffer. Whether
+    the consumer keeps up with the solver depends on what it does per trace;
+    canonicalizing a trace costs more the more symmetric atoms it has.
+    max_instances limits the raw instances, before duplicates are removed.
+    Raises CalledProcessError if AlloyEnumerator fails.
+    """
+    args = ['java', '-cp', classpath, 'AlloyEnumerator', als_file, str(command_index)]
+    if max_instances is not None:
+        args.append(str(max_instances))
+
+    process = subprocess.Popen(args, stdout=subprocess.PIPE, text=True)
+    try:
+        for line in process.stdout:
+            yield json.loads(line)
+    except BaseException:
+        # Stop the solver when the consumer stops early or reading fails
+        process.stdout.close()
+        process.terminate()
+        process.wait()
+        raise
+
+    process.stdout.close()
+    if process.wait() != 0:
+        raise subprocess.CalledProcessError(process.returncode, args)
+
+def is_atom(value):
+    """Return whether a tuple element is a sig atom (e.g. 'Input$0') and not an integer."""
+    return '$' in value
+
+def atom_sig(atom):
+    """Return the sig name of an atom like 'Input$0'."""
+    return atom.rsplit('$', 1)[0]
+
+def refine(facts, atoms, colours):
+    """Recolour atoms by the colours of the tuples they appear in until the colours stabilize.
+
+    Colours never depend on atom names, only on sig names, integers and structure.
+    """
+    distinct = len(set(colours.values()))
+
+    while True:
+        signatures = {atom: [] for atom in atoms}
+        for state, label, tup in facts:
+            coloured = tuple(colours.get(value, value) for value in tup)
+            for position, value in enumerate(tup):
+                if value in signatures:
+                    signatures[value].append((state, label, position, coloured))
+
+        refined = {
+            atom: hashlib.sha256(repr((colours[atom], sorted(signature))).encode()).hexdigest()
+            for atom, signature in signatures.items()
+        }
+        refined_distinct = len(set(refined.values()))
+        colours = refined
+        if refined_distinct == distinct:
+            return colours
+        distinct = refined_distinct
+
+def are_twins(incident, a, b):
+    """Return whether swapping atoms a and b maps the trace onto itself."""
+    swap = {a: b, b: a}
+    facts = incident[a] | incident[b]
+    swapped = {(state, label, tuple(swap.get(value, value) for value in tup))
+               for state, label, tup in facts}
+    return swapped == facts
+
+def rename(trace, renaming):
+    """Return the trace with its atoms renamed and its relations and tuples sorted."""
+    return {
+        'loop': trace['loop'],
+        'states': [
+            {
+                label: sorted([renaming.get(value, value) for value in tup] for tup in tuples)
+                for label, tuples in sorted(relations.items())
+            }
+            for relations in trace['states']
+        ]
+    }
+
+def orbit_finder(atoms, generators, fixed):
+    """Return a function mapping each atom to a representative of its orbit.
+
+    Only the automorphisms that fix every atom in fixed are used, so the orbits
+    are those of (a subgroup of) the stabilizer of the individualized atoms.
+    """
+    parent = {atom: atom for atom in atoms}
+
+    def find(atom):
+        while parent[atom] != atom:
+            parent[atom] = parent[parent[atom]]
+            atom = parent[atom]
+        return atom
+
+    for generator in generators:
+        if all(generator.get(atom, atom) == atom for atom in fixed):
+            for atom, image in generator.items():
+                parent[find(atom)] = find(image)
+    return find
+
+def search(trace, facts, atoms, incident, colours, path, frames, state):
+    """Explore the individualization-refinement tree below path, keeping the smallest leaf in state.
+
+    Two leaves with the same encoding give an automorphism of the trace. Tied
+    atoms in the same orbit of the automorphisms fixing path lead to isomorphic
+    subtrees, so only one of them is explored.
+    """
+    colours = refine(facts, atoms, colours)
+
+    classes = {}
+    for atom in atoms:
+        classes.setdefault((atom_sig(atom), colours[atom]), []).append(atom)
+
+    tied = sorted(key for key, members in classes.items() if len(members) > 1)
+    if not tied:
+        renaming = {}
+        counters = {}
+        for sig, colour in sorted(classes):
+            atom = classes[(sig, colour)][0]
+            renaming[atom] = f"{sig}${counters.get(sig, 0)}"
+            counters[sig] = counters.get(sig, 0) + 1
+
+        canonical = rename(trace, renaming)
+        encoding = json.dumps(canonical, sort_keys=True, separators=(',', ':'))
+
+        best = state['best']
+        if best is None or encoding < best[0]:
+            state['best'] = (encoding, canonical, renaming)
+        elif encoding == best[0]:
+            # Map every atom to the atom with the same name in the best leaf
+            inverse = {name: atom for atom, name in best[2].items()}
+            generator = {atom: inverse[name] for atom, name in renaming.items() if inverse[name] != atom}
+            state['generators'].append(generator)
+
+            # Jump back to the shallowest node whose current subtree is now
+            # known to be isomorphic to one already explored
+            for depth, (frame_path, explored, current) in enumerate(frames):
+                find = orbit_finder(atoms, state['generators'], frame_path)
+                if any(find(current) == find(other) for other in explored):
+                    state['abort_to'] = depth
+                    break
+        return
+
+    depth = len(frames)
+    explored = []
+    for atom in sorted(classes[tied[0]]):
+        # Swapping twins is an automorphism fixing path, so they share an orbit
+        find = orbit_finder(atoms, state['generators'], path)
+        if any(find(atom) == find(other) or are_twins(incident, atom, other) for other in explored):
+            continue
+
+        individualized = dict(colours)
+        individualized[atom] = hashlib.sha256((colours[atom] + '*').encode()).hexdigest()
+
+        frames.append((path, explored, atom))
+        search(trace, facts, atoms, incident, individualized, path + [atom], frames, state)
+        frames.pop()
+        explored.append(atom)
+
+        if state['abort_to'] is not None:
+            if state['abort_to'] < depth:
+                return
+            state['abort_to'] = None
+
+def canonicalize(trace):
+    """Rename the atoms of a trace so that traces which only differ by renaming atoms are equal.
+
+    Atoms start with the colour of their sig and are refined by the colours of
+    the tuples they appear in. While some atoms of a sig still share a colour,
+    each of them is in turn given a colour of its own and the colours are refined
+    again (individualization-refinement). Atoms are renumbered per sig in order of
+    their colour, and the renaming with the smallest encoding is kept. Tied atoms
+    that are symmetric under automorphisms found along the way are skipped, so
+    the cost grows polynomially with the number of symmetric atoms.
+    """
+    facts = []
+    atoms = set()
+    for state, relations in enumerate(trace['states']):
+        for label, tuples in relations.items():
+            for tup in tuples:
+                facts.append((state, label, tuple(tup)))
+                atoms.update(value for value in tup if is_atom(value))
+
+    incident = {atom: set() for atom in atoms}
+    for fact in facts:
+        for value in fact[2]:
+            if value in incident:
+                incident[value].add(fact)
+
+    colours = {atom: atom_sig(atom) for atom in atoms}
+    state = {'best': None, 'generators': [], 'abort_to': None}
+    search(trace, facts, atoms, incident, colours, [], [], state)
+    return state['best'][1]
+
+def digest(canonical):
+    """Return a 16-byte digest of a canonicalized trace."""
+    encoded = json.dumps(canonical, sort_keys=True, separators=(',', ':')).encode()
+    return hashlib.blake2b(encoded, digest_size=16).digest()
+
+def canonical_hash(trace):
+    """Return a digest identifying a trace up to renaming of its atoms."""
+    return digest(canonicalize(trace))
+
+def unique_traces(traces):
+    """Yield the canonical form of every trace not seen before (up to renaming of atoms).
+
+    The 16-byte digest of every distinct trace seen is kept, so memory grows
+    with the number of distinct traces (about 100 bytes each).
+    """
+    seen = set()
+    for trace in traces:
+        canonical = canonicalize(trace)
+        key = digest(canonical)
+        if key in seen:
+            continue
+        seen.add(key)
+        yield canonical
+
+def write_batches(traces, output_dir, batch_size=1000, prefix='traces'):
+    """Write traces to gzipped JSON-lines files of at most batch_size traces each.
+
+    Returns the number of traces written.
+    """
+    count = 0
+    batch = None
+
+    try:
+        for trace in traces:
+            if count % batch_size == 0:
+                if batch is not None:
+                    batch.close()
+                batch_file = os.path.join(output_dir, f"{prefix}_{count // batch_size:05d}.jsonl.gz")
+                batch = gzip.open(batch_file, 'wt', encoding='utf-8')
+
+            batch.write(json.dumps(trace, separators=(',', ':')) + '\n')
+            count += 1
+    finally:
+        if batch is not None:
+            batch.close()
+
+    return count
+
+def paired_trace(pairs, states, seed):
+    """Return a trace with pairs of ForcedInput/Input atoms linked by ForcedInput.tx, shuffled by seed."""
+    rnd = random.Random(seed)
+    forced = [f"ForcedInput${i}" for i in range(pairs)]
+    inputs = [f"Input${i}" for i in range(pairs)]
+    rnd.shuffle(forced)
+    rnd.shuffle(inputs)
+
+    relations = {
+        'this/ForcedInput': [[atom] for atom in forced],
+        'this/Input': [[atom] for atom in inputs],
+        'this/ForcedInput.tx': [[forced[i], inputs[i]] for i in range(pairs)]
+    }
+    return {'loop': 0, 'states': [relations] * states}
+
+def check_canonicalization(pairs=10, states=3, relabellings=3, budget=1.0):
+    """Time the canonical hash of a highly symmetric trace and check it ignores atom names.
+
+    Every ForcedInput/Input pair can be swapped with any other, which is the
+    worst case for the search without automorphism pruning (pairs! leaves).
+    Returns whether all relabellings hash the same within budget seconds each.
+    """
+    start = time.perf_counter()
+    hashes = {canonical_hash(paired_trace(pairs, states, seed)) for seed in range(relabellings)}
+    elapsed = (time.perf_counter() - start) / relabellings
+
+    print(f"Canonical hash of {pairs} ForcedInput/Input pairs over {states} states: "
+          f"{elapsed:.3f}s per trace, {len(hashes)} distinct hash(es) over {relabellings} relabellings")
+    return len(hashes) == 1 and elapsed <= budget
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('als_file', nargs='?', help='Alloy model file with run commands (e.g. rollup_scenarios.als)')
+    parser.add_argument('output_dir', nargs='?',
+                        help='Directory to save the traces (must not exist)')
+    parser.add_argument('--command', type=int, nargs='+',
+                        help='Indices of the commands to enumerate (see --list)')
+    parser.add_argument('--list', action='store_true',
+                        help='List the commands of the model and exit')
+    parser.add_argument('--check', action='store_true',
+                        help='Check the speed and correctness of the canonical hash on a symmetric trace and exit')
+    parser.add_argument('--limit', type=int,
+                        help='Maximum number of distinct traces to save per command (default: all)')
+    parser.add_argument('--batch-size', type=int, default=1000,
+                        help='Number of traces per batch file (default: 1000)')
+    parser.add_argument('--classpath', default='.:lib/*',
+                        help="Classpath with AlloyEnumerator and the Alloy JARs (default: '.:lib/*')")
+    args = parser.parse_args()
+
+    if args.check:
+        sys.exit(0 if check_canonicalization() else 1)
+
+    if args.als_file is None:
+        parser.error('als_file is required unless --check is given')
+
+    if args.list:
+        for index, command in list_commands(args.als_file, args.classpath):
+            print(f"{index}: {command}")
+        return
+
+    if args.output_dir is None or args.command is None:
+        parser.error('output_dir and --command are required unless --list is given')
+
+    if os.path.exists(args.output_dir):
+        print(f"Directory already exists: {args.output_dir}")
+        sys.exit(1)
+    os.makedirs(args.output_dir)
+
+    for command_index in args.command:
+        instances = stream_instances(args.als_file, command_index, args.classpath)
+        traces = itertools.islice(unique_traces(instances), args.limit)
+
+        # Closing the generator once the limit is reached stops AlloyEnumerator
+        try:
+            count = write_batches(traces, args.output_dir, args.batch_size,
+                                  prefix=f"cmd{command_index}")
+        finally:
+            instances.close()
+        print(f"Command {command_index}: {count} distinct traces saved in '{args.output_dir}'")
+
+if __name__ == "__main__":
+    main()
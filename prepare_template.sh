@@ -1,14 +1,28 @@
 #!/bin/bash
 
-if [ "$#" -ne 2 ]; then
-  echo "Usage: $0 N M"
+if [ "$#" -lt 2 ] || [ "$#" -gt 3 ]; then
+  echo "Usage: $0 N M [rollup|scroll]"
   exit 1
 fi
 
 N="$1"
 M="$2"
-TEMPLATE="rollup_properties_template_N_M.als"
-OUTPUT="rollup_properties_${N}_${M}.als"
+MODEL="${3:-rollup}"
+
+case "$MODEL" in
+  rollup)
+    TEMPLATE="rollup_properties_template_N_M.als"
+    OUTPUT="rollup_properties_${N}_${M}.als"
+    ;;
+  scroll)
+    TEMPLATE="scroll/scroll_properties_template_N_M.als"
+    OUTPUT="scroll/scroll_properties_${N}_${M}.als"
+    ;;
+  *)
+    echo "Unknown model $MODEL (expected rollup or scroll)"
+    exit 1
+    ;;
+esac
 
 if [ ! -f "$TEMPLATE" ]; then
   echo "Template file $TEMPLATE not found!"
@@ -22,4 +36,4 @@ if [ $? -eq 0 ]; then
 else
   echo "Failed to generate $OUTPUT."
   exit 3
-fi 
\ No newline at end of file
+fi